@@ -23,7 +23,8 @@ from ..schema.base import (
     MetaUniqueIndexField, get_container_type, get_root_container_type,
     get_field_names_for, get_part_types, is_field_list_or_tuple_of,
     PersistentModel, is_list_or_tuple_of, get_stored_fields,
-    get_stored_fields_for, get_identifying_field_values,
+    get_stored_fields_by_metadata, get_stored_fields_by_predicate, 
+    get_identifying_field_values,
     get_identifying_fields, MetaStoredField, MetaIdentifyingField
 )
 from ..schema.typed import get_type_for_table
@@ -354,11 +355,11 @@ def get_sql_for_creating_table(type_:Type[PersistentModelT]):
 
 
 def get_stored_fields_for_full_text_search(type_:Type[PersistentModelT]):
-    return get_stored_fields_for(type_, MetaFullTextSearchedField)
+    return get_stored_fields_by_metadata(type_, MetaFullTextSearchedField)
 
 
 def get_stored_fields_for_part_of(type_:Type[PersistentModelT]):
-    return get_stored_fields_for(type_, 
+    return get_stored_fields_by_predicate(type_, 
         lambda paths, type_: 
             not _is_come_from_container_field(paths) 
             or has_metadata(type_, MetaFullTextSearchedField)
@@ -372,7 +373,7 @@ def _is_come_from_container_field(paths:Tuple[str,...]) -> bool:
 def get_stored_fields_for_external_index(type_:Type[PersistentModelT]):
     return {name:(path, field_type)
         for name, (path, field_type) 
-        in get_stored_fields_for(type_, MetaIndexField).items()
+        in get_stored_fields_by_metadata(type_, MetaIndexField).items()
         if is_derived_from(field_type, (tuple, list))
     }
 
@@ -2255,7 +2256,7 @@ def _build_namespace_types(base_type:Type, join:Dict[str, Type],
 
 def _build_join_from_refs(current_type:Type, current_ns:str, 
                           namespaces: Set[str]) -> Iterator[Tuple[str, Type]]:
-    refs = get_stored_fields_for(current_type, MetaReferenceField)
+    refs = get_stored_fields_by_metadata(current_type, MetaReferenceField)
 
     for field_name, (_, field_type) in refs.items():
         if any(field_name in ns for ns in namespaces):
@@ -2293,7 +2294,7 @@ def _find_join_keys(join:Tuple[Tuple[str, Type],...]
 
 
 def _find_join_key(base_type:Type, target_type:Type, reversed:bool = False) -> Tuple[str, str] | None:
-    refs = get_stored_fields_for(base_type, MetaReferenceField)
+    refs = get_stored_fields_by_metadata(base_type, MetaReferenceField)
 
     for field_name, (_, field_type) in refs.items():
         ref_field = get_metadata_for(field_type, MetaReferenceField)
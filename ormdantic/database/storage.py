@@ -16,8 +16,8 @@ from ..util import get_logger, is_derived_from, L
 from ..schema import ModelT, PersistentModel, get_container_type
 from ..schema.base import (
     PartOfMixin, PersistentModel, allocate_fields_if_empty, 
-    get_part_types, PersistentModelT,
-    get_identifying_fields, get_identifying_field_values
+    allocate_fields_if_empty_many, get_part_types, PersistentModelT,
+    get_identifying_fields
 )
 from ..schema.verinfo import VersionInfo
 from ..schema.source import QueryConditionType, to_normalize_query_condition
@@ -142,16 +142,13 @@ def upsert_objects(pool:DatabaseConnectionPool,
 
     with pool.open_cursor(True) as cursor:
         # we get next seq in current db transaction.
-        targets = tuple(
-            allocate_fields_if_empty(
-                m, next_seq=lambda f: _next_seq_for(cursor, type(m), f))
-            for m in model_list
-        )
+        # allocate_fields_if_empty_many returns new list. it is updated directly.
+        targets = allocate_fields_if_empty_many(
+            model_list, next_seq=lambda t, f: _next_seq_for(cursor, t, f))
 
-        targets = tuple(
-            m.copy(deep=True) if has_shared_models(m) else m
-            for m in targets
-        )
+        for index, model in enumerate(targets):
+            if has_shared_models(model):
+                targets[index] = model.copy(deep=True)
 
         allocate_audit_version(cursor, version_info)
 
@@ -162,7 +159,7 @@ def upsert_objects(pool:DatabaseConnectionPool,
 
             # we will remove content of the given model. so, we copy it and remove them.
             # for not updating original model.
-            id_values = tuple(get_identifying_field_values(model).values())
+            id_values = tuple(getattr(model, f) for f in get_identifying_fields(type(model)))
             results[id_values] = model
 
             try:
@@ -200,7 +197,7 @@ def upsert_objects(pool:DatabaseConnectionPool,
         if isinstance(models, PersistentModel):
             return targets[0]
 
-        return targets
+        return tuple(targets)
 
 
 def fetch_multiple_set(cursor:DictCursor) -> Iterator[Dict[str, Any]]:
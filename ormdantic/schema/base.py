@@ -1,11 +1,11 @@
 from typing import (
     Any, ForwardRef, Tuple, Dict, Type, Generic, TypeVar, Iterator, Callable, 
-    List, ClassVar, cast, Annotated
+    List, ClassVar, Iterable, Mapping, cast, Annotated, get_origin
 )
+from types import MappingProxyType
 import datetime
 import inspect
 import functools
-import operator
 from uuid import uuid4
 
 import orjson
@@ -16,49 +16,241 @@ from pydantic import (
     PrivateAttr,
 )
 from pydantic.fields import FieldInfo
+from pydantic.utils import ROOT_KEY
 from pydantic.main import ModelMetaclass, __dataclass_transform__
 
 from ..util import (
     get_logger, get_base_generic_alias_of, get_type_args, 
-    update_forward_refs_in_generic_base,
+    update_forward_refs_in_generic_base, has_forward_ref,
     is_derived_from, resolve_forward_ref, is_list_or_tuple_of,
     resolve_forward_ref_in_args, is_derived_or_collection_of_derived,
-    unique, convert_tuple, has_metadata, L
+    has_metadata, get_union_type_arguments, get_mro_with_generic, L
 )
 
 JsonPathAndType = Tuple[Tuple[str,...], Type[Any]]
 StoredFieldDefinitions = Dict[str, JsonPathAndType]
  
 T = TypeVar('T')
+_F = TypeVar('_F', bound=Callable)
 ScalarType = bool | int | Decimal | datetime.datetime | datetime.date | str | float
 
+# numpy arrays are serialized natively. OPT_NON_STR_KEYS is not used because
+# it makes serializing of all str keyed dict slower and the converted keys
+# could be collided. OPT_NAIVE_UTC is not used because it changes the output 
+# of naive datetime which is stored and digested already.
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
 def orjson_dumps(v, *, default=None):
     # orjson.dumps returns bytes, to match standard json.dumps we need to decode
-    return orjson.dumps(v, default=default).decode()
+    return orjson.dumps(v, default=default, option=_ORJSON_OPTIONS).decode()
+
+
+def orjson_dumps_bytes(v, *, default=None) -> bytes:
+    return orjson.dumps(v, default=default, option=_ORJSON_OPTIONS)
+
+
+class MetaField():
+    __slots__ = ()
+    _fields : Tuple[str, ...] = tuple()
+
+    def __eq__(self, other):
+        return (
+            type(self) is type(other) and 
+            self._get_values() == other._get_values()
+        )
+
+    def __hash__(self):
+        if self._fields:
+            return hash(self._get_values())
+        return 0
+
+    def _get_values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, f) for f in self._fields)
+
+class MetaStoredField(MetaField):
+    ''' the json value will be saved as table fields. '''
+    __slots__ = ()
+
+
+class MetaReferenceField(MetaStoredField):
+    ''' refenence key which indicate other row in other table like database's foreign key 
+        ModelT will describe the type which is referenced.
+    '''
+    __slots__ = ('target_type', 'target_field',)
+    _fields = ('target_type', 'target_field',)
+
+    def __init__(self, target_type:Type, target_field:str):
+        self.target_type = target_type
+        self.target_field = target_field
+
+
+class MetaIdentifyingField(MetaStoredField):
+    __slots__ = ()
+
+
+
+class MetaIndexField(MetaStoredField):
+    ''' the json value will be indexed as table fields. '''
+    __slots__ = ('max_length',)
+    _fields = ('max_length',)
+
+    def __init__(self, max_length:int | None = None):
+        self.max_length = max_length
+
+
+class MetaUniqueIndexField(MetaIndexField):
+    ''' the json value will be indexed as unique. '''
+    __slots__ = ()
+
+
+class MetaFullTextSearchedField(MetaStoredField):
+    ''' the json value will be used by full text searching.'''
+    __slots__ = ('max_length',)
+    _fields = ('max_length',)
+
+    def __init__(self, max_length:int | None = None):
+        self.max_length = max_length
 
 
-_postprocessors: Dict[Type, Callable[[Type], None]] = {}
+class AutoAllocatedMixin():
+    ''' the json value will be used for identifing the object. 
+    The value of this type will be update through the sql param 
+    so, this field of database will not use stored feature.
+    If multiple fields was declared as IdentifyingMixin in a class, 
+    the all fields will be an unique key. '''
+    __slots__ = ()
+
+    def new_if_empty(self:T, **kwds) -> T:
+        raise NotImplementedError('fill if exist should be implemented.')
+
+
+_STORED_FIELDS_ATTR = '__ormdantic_stored_fields__'
+
+_type_caches: List[Any] = []
+
+def cache_for_type(func:_F) -> _F:
+    ''' cache the result of function which is decided by the fields of type.
+        the cached results will be cleared by update_forward_refs because the 
+        fields can be changed after the forward references are resolved.
+    '''
+    cached = functools.cache(func)
+    _type_caches.append(cached)
+
+    return cast(_F, cached)
+
+
+def clear_type_caches():
+    for cached in _type_caches:
+        cached.cache_clear()
+
+
+_Postprocessor = Callable[[Type], None]
+_Preprocessor = Callable[[str, Tuple[Type,...], Dict[str, Any]], None]
+
+_postprocessors: Dict[Type, _Postprocessor] = {}
+# processors which are applied to the class derived from the bases.
+# most classes share the same bases like (PersistentModel,), so we keep the
+# matched processors by bases.
+_postprocessor_index: Dict[Tuple[Type, ...], Tuple[_Postprocessor, ...]] = {}
 
 def _postprocess_class(new_one:Type):
-    for base_type, processor in _postprocessors.items():
-        if any(b is base_type for b in inspect.getmro(new_one)):
-            processor(new_one)
+    bases = new_one.__bases__
+    processors = _postprocessor_index.get(bases)
+
+    if processors is None:
+        processors = tuple(
+            processor for base_type, processor in _postprocessors.items()
+            if issubclass(new_one, base_type)
+        )
+        _postprocessor_index[bases] = processors
+
+    for processor in processors:
+        processor(new_one)
 
 
-_preprocessors: Dict[Type, Callable[[str, Tuple[Type,...], Dict[str, Any]], None]] = {}
+_preprocessors: Dict[Type, _Preprocessor] = {}
+_preprocessor_index: Dict[Tuple[Type, ...], Tuple[_Preprocessor, ...]] = {}
 
 def _preprocess_class(name:str, bases:Tuple[Type,...], namespace:Dict[str, Any]):
-    for base_type, processor in _preprocessors.items():
-        if any(a is base_type for base in bases for a in inspect.getmro(base)):
-            processor(name, bases, namespace)
+    processors = _preprocessor_index.get(bases)
+
+    if processors is None:
+        # class is not created yet, so collect the mro of bases once.
+        mro = {a for base in bases for a in base.__mro__}
+        processors = tuple(
+            processor for base_type, processor in _preprocessors.items()
+            if base_type in mro
+        )
+        _preprocessor_index[bases] = processors
+
+    for processor in processors:
+        processor(name, bases, namespace)
 
 
-def register_class_preprocessor(base_type:Type, processor:Callable[[str, Tuple[Type,...], Dict[str, Any]], None]):
+def register_class_preprocessor(base_type:Type, processor:_Preprocessor):
     _preprocessors[base_type] = processor
+    _preprocessor_index.clear()
 
 
-def register_class_postprocessor(base_type:Type, processor:Callable[[Type], None]):
+def register_class_postprocessor(base_type:Type, processor:_Postprocessor):
     _postprocessors[base_type] = processor
+    _postprocessor_index.clear()
+
+
+def _get_annotated_identifiers(type_:Type) -> Tuple[str, ...]:
+    return tuple(
+        field_name for field_name, model_field in type_.__fields__.items()
+        if has_metadata(model_field.outer_type_, MetaIdentifyingField)
+    )
+
+
+def _get_auto_allocated_fields(type_:Type) -> Tuple[str, ...]:
+    return tuple(
+        field_name for field_name, model_field in type_.__fields__.items()
+        if _can_hold_auto_allocated(model_field.outer_type_)
+    )
+
+
+def _can_hold_auto_allocated(field_type:Type) -> bool:
+    # Annotated[NewType, ...] has origin. check the annotated type.
+    if get_origin(field_type) is Annotated:
+        field_type = field_type.__origin__
+
+    # TypeVar, NewType, unresolved ForwardRef and Any (before python 3.11) are 
+    # neither class nor generic alias. they could not hold AutoAllocatedMixin.
+    # ForwardRef will be checked again in update_forward_refs.
+    if not inspect.isclass(field_type) and get_origin(field_type) is None:
+        return False
+
+    return any(
+        _can_hold_auto_allocated(t) if t is not field_type 
+        else is_derived_or_collection_of_derived(t, AutoAllocatedMixin)
+        for t in get_union_type_arguments(field_type) or (field_type,)
+    )
+
+
+def _get_identifying_fields(type_:Type) -> Tuple[str, ...]:
+    # same as the keys of get_stored_fields which have MetaIdentifyingField.
+    # but json paths are not built and validated here.
+    field_types = {
+        field_name: model_field.outer_type_ 
+        for field_name, model_field in type_.__fields__.items()
+        if has_metadata(model_field.outer_type_, MetaStoredField)
+    }
+
+    for base in reversed(type_.__mro__):
+        # only PersistentModel has _stored_fields. PersistentModel could not be 
+        # used here because it is not defined while it is created.
+        if hasattr(base, '_stored_fields'):
+            field_types.update(
+                (field_name, field_type) 
+                for field_name, (_, field_type) in base._stored_fields.items()
+            )
+
+    return tuple(
+        field_name for field_name, field_type in field_types.items()
+        if has_metadata(field_type, MetaIdentifyingField)
+    )
 
 
 @__dataclass_transform__(kw_only_default=True, field_descriptors=(Field, FieldInfo))
@@ -70,16 +262,38 @@ class SchemaBaseMetaclass(ModelMetaclass):
 
         _postprocess_class(new_one)
 
+        # the identifying fields are read for every model. so, we keep them in class.
+        new_one.__ormdantic_annotated_identifiers__ = _get_annotated_identifiers(new_one)
+        new_one.__ormdantic_identifying_fields__ = _get_identifying_fields(new_one)
+        new_one.__ormdantic_auto_allocated_fields__ = _get_auto_allocated_fields(new_one)
+
         return new_one
  
 
 class SchemaBaseModel(BaseModel, metaclass=SchemaBaseMetaclass):
+    # fields which are annotated with MetaIdentifyingField. not _stored_fields
+    __ormdantic_annotated_identifiers__: ClassVar[Tuple[str, ...]]
+    # stored fields which have MetaIdentifyingField including _stored_fields
+    __ormdantic_identifying_fields__: ClassVar[Tuple[str, ...]]
+    # fields which can hold AutoAllocatedMixin
+    __ormdantic_auto_allocated_fields__: ClassVar[Tuple[str, ...]]
+
     class Config:
         title = 'model which can generate json schema.'
 
         json_dumps = orjson_dumps
         json_loads = orjson.loads
 
+    def json_bytes(self, **kwds) -> bytes:
+        ''' same as json() but returns the bytes of orjson without decoding.
+        use it if the caller can consume bytes like network or database. '''
+        data = self.dict(**kwds)
+
+        if self.__custom_root_type__:
+            data = data[ROOT_KEY]
+
+        return orjson_dumps_bytes(data, default=self.__json_encoder__)
+
 
 class PersistentModel(SchemaBaseModel):
     _stored_fields: ClassVar[StoredFieldDefinitions] = {
@@ -104,65 +318,14 @@ PersistentModelT = TypeVar('PersistentModelT', bound=PersistentModel)
 
 _logger = get_logger(__name__)
 
-class MetaField():
-    _fields = tuple()
-    def __eq__(self, other):
-        return (
-            type(self) == type(other) and 
-            all(getattr(self, f) == getattr(other, f) for f in self._fields)
-        )
-
-    def __hash__(self):
-        if self._fields:
-            return functools.reduce(operator.xor, [hash(getattr(self, f)) for f in self._fields ])
-        return 0
-
-class MetaStoredField(MetaField):
-    ''' the json value will be saved as table fields. '''
-    pass
-
-
-class MetaReferenceField(MetaStoredField):
-    ''' refenence key which indicate other row in other table like database's foreign key 
-        ModelT will describe the type which is referenced.
-    '''
-    _fields = ('target_type', 'target_field',)
-
-    def __init__(self, target_type:Type, target_field:str):
-        self.target_type = target_type
-        self.target_field = target_field
-
-
-class MetaIdentifyingField(MetaStoredField):
-    pass
-
-
-
-class MetaIndexField(MetaStoredField):
-    ''' the json value will be indexed as table fields. '''
-    def __init__(self, max_length:int | None = None):
-        self.max_length = max_length
-
-
-class MetaUniqueIndexField(MetaIndexField):
-    ''' the json value will be indexed as unique. '''
-    pass
-
-
-class MetaFullTextSearchedField(MetaStoredField):
-    ''' the json value will be used by full text searching.'''
-    def __init__(self, max_length:int | None = None):
-        self.max_length = max_length
-
-
 class PartOfMixin(Generic[ModelT]):
     '''part of some json. ModelT will be container. '''
-    pass
+    __slots__ = ()
 
 
 class UseBaseClassTableMixin():
     '''use table of base class.'''
-    pass
+    __slots__ = ()
 
 
 
@@ -178,24 +341,12 @@ DateTimeIndex = Annotated[datetime.datetime, MetaIndexField()]
 StringArrayIndex = Annotated[List[str], MetaIndexField()]
 IntegerArrayIndex = Annotated[List[int], MetaIndexField()]
 
-class AutoAllocatedMixin():
-    ''' the json value will be used for identifing the object. 
-    The value of this type will be update through the sql param 
-    so, this field of database will not use stored feature.
-    If multiple fields was declared as IdentifyingMixin in a class, 
-    the all fields will be an unique key. '''
-    
-    def new_if_empty(self:T, **kwds) -> T:
-        raise NotImplementedError('fill if exist should be implemented.')
-
-
-
 class UuidStr(ConstrainedStr, AutoAllocatedMixin):
     max_length = 64 # sha256 return 64 char
     ''' identified id string sha256 or uuid'''
 
     def new_if_empty(self, **kwds) -> 'UuidStr':
-        if self == '':
+        if not self:
             return UuidStr(uuid4().hex)
 
         return self
@@ -206,7 +357,7 @@ class SequenceStr(ConstrainedStr, AutoAllocatedMixin):
     prefix = 'N'
 
     def new_if_empty(self, **kwds) -> 'SequenceStr':
-        if self == '':
+        if not self:
             next_seq = kwds['next_seq']
             return SequenceStr(self.prefix + str(next_seq()))
 
@@ -225,6 +376,7 @@ class DatedMixin(SchemaBaseModel):
     pass
 
 
+@cache_for_type
 def get_container_type(type_:Type[ModelT]) -> Type[ModelT] | None:
     ''' get the type of container '''
     part_type = get_base_generic_alias_of(cast(Type, type_), PartOfMixin)
@@ -235,6 +387,7 @@ def get_container_type(type_:Type[ModelT]) -> Type[ModelT] | None:
     return None
 
 
+@cache_for_type
 def get_root_container_type(type_:Type[ModelT]) -> Type[ModelT] | None:
     while container_type := get_container_type(type_):
         if not is_derived_from(container_type, PartOfMixin):
@@ -245,58 +398,65 @@ def get_root_container_type(type_:Type[ModelT]) -> Type[ModelT] | None:
     return None
 
 
+@cache_for_type
 def get_field_names_for(type_:Type, *types:Type) -> Tuple[str,...]:
-    types = convert_tuple(types)
+    if not is_derived_from(type_, BaseModel):
+        _logger.fatal(f'type_ {type_=}should be subclass of BaseModel. '
+                      f'check the mro {type_.__mro__}')
+        raise RuntimeError(L('invalid type {0}.', type_))
 
-    return tuple(field_name for field_name, _ in get_field_name_and_type(type_, *types))
+    return tuple(
+        field_name for field_name, model_field in type_.__fields__.items()
+        if not types or any(
+            is_derived_or_collection_of_derived(model_field.outer_type_, t) for t in types
+        )
+    )
 
 
+@cache_for_type
 def get_field_name_and_type(type_:Type, 
                             *target_types: Type,
                             ) -> Tuple[Tuple[str, Type]]:
     if not is_derived_from(type_, BaseModel):
         _logger.fatal(f'type_ {type_=}should be subclass of BaseModel. '
-                      f'check the mro {inspect.getmro(type_)}')
+                      f'check the mro {type_.__mro__}')
         raise RuntimeError(L('invalid type {0}.', type_))
 
-    target_types = convert_tuple(target_types) 
-
-    name_and_types = []
-
-    for field_name, model_field in type_.__fields__.items():
-        field_type = model_field.outer_type_ 
+    fields = type_.__fields__.items()
 
-        if not target_types or any(is_derived_or_collection_of_derived(field_type, t) for t in target_types):
-            name_and_types.append((field_name, model_field.outer_type_))
+    if not target_types:
+        return tuple((name, field.outer_type_) for name, field in fields)
 
-    return tuple(name_and_types)
+    return tuple(
+        (name, field.outer_type_) for name, field in fields
+        if any(is_derived_or_collection_of_derived(field.outer_type_, t) for t in target_types)
+    )
 
 
+@cache_for_type
 def get_field_name_and_type_for_annotated(type_:Type, 
                             *target_types: Type,
                             ) -> Tuple[Tuple[str, Type]]:
     if not is_derived_from(type_, BaseModel):
         _logger.fatal(f'type_ {type_=}should be subclass of BaseModel. '
-                      f'check the mro {inspect.getmro(type_)}')
+                      f'check the mro {type_.__mro__}')
         raise RuntimeError(L('invalid type {0}.', type_))
 
-    target_types = convert_tuple(target_types) 
-
-    name_and_types = []
+    fields = type_.__fields__.items()
 
-    for field_name, model_field in type_.__fields__.items():
-        field_type = model_field.outer_type_ 
+    if not target_types:
+        return tuple((name, field.outer_type_) for name, field in fields)
 
-        if not target_types or any(has_metadata(field_type, t) for t in target_types):
-            name_and_types.append((field_name, model_field.outer_type_))
-
-    return tuple(name_and_types)
+    return tuple(
+        (name, field.outer_type_) for name, field in fields
+        if any(has_metadata(field.outer_type_, t) for t in target_types)
+    )
 
 
 def get_field_type(type_:Type[ModelT], field_name:str) -> type:
     if not is_derived_from(type_, BaseModel):
         _logger.fatal(f'type_ {type_=} should be the subclass of BaseModel. '
-                      f'check the mro {inspect.getmro(type_)}')
+                      f'check the mro {type_.__mro__}')
         raise RuntimeError(L('invalid type {0}.', type_))
 
     return type_.__fields__[field_name].outer_type_
@@ -305,14 +465,35 @@ def get_field_type(type_:Type[ModelT], field_name:str) -> type:
 def update_forward_refs(type_:Type[ModelT], localns:Dict[str, Any]):
     type_.update_forward_refs(**localns)
 
+    fields_to_resolve = [
+        model_field for model_field in type_.__fields__.values() 
+        if has_forward_ref(model_field.outer_type_)
+    ]
+
+    if not fields_to_resolve and not any(
+            has_forward_ref(base) for base in getattr(type_, '__orig_bases__', ())):
+        # nothing is changed. keep the caches.
+        return
+
     # resolve outer type also,
-    for model_field in type_.__fields__.values(): 
+    for model_field in fields_to_resolve: 
         if isinstance(model_field.outer_type_, ForwardRef):
             model_field.outer_type_ = resolve_forward_ref(model_field.outer_type_, localns)
         else:
             model_field.outer_type_ = resolve_forward_ref_in_args(model_field.outer_type_, localns)
         
     update_forward_refs_in_generic_base(type_, localns)
+    # __orig_bases__ is changed. the generic mro should be built again.
+    get_mro_with_generic.cache_clear()
+
+    type_.__ormdantic_annotated_identifiers__ = _get_annotated_identifiers(type_)
+    type_.__ormdantic_identifying_fields__ = _get_identifying_fields(type_)
+    type_.__ormdantic_auto_allocated_fields__ = _get_auto_allocated_fields(type_)
+
+    if _STORED_FIELDS_ATTR in type_.__dict__:
+        delattr(type_, _STORED_FIELDS_ATTR)
+
+    clear_type_caches()
 
 
 def is_field_list_or_tuple_of(type_:Type, field_name:str, *parameters:Type) -> bool:
@@ -321,9 +502,11 @@ def is_field_list_or_tuple_of(type_:Type, field_name:str, *parameters:Type) -> b
     return is_list_or_tuple_of(model_field.outer_type_, *parameters)
 
 
+@cache_for_type
 def get_part_types(type_:Type) -> Tuple[Type]:
+    # dict keeps the insertion order. so, we can use it for removing duplicated.
     return tuple(
-        unique(
+        dict.fromkeys(
             model_field.type_
             for model_field in type_.__fields__.values()
             if is_derived_from(model_field.type_, PartOfMixin)
@@ -332,21 +515,55 @@ def get_part_types(type_:Type) -> Tuple[Type]:
         
 
 def get_identifer_of(model:SchemaBaseModel) -> Iterator[Tuple[str, Any]]:
-    for field_name, model_field in type(model).__fields__.items(): 
-        if has_metadata(model_field.outer_type_, MetaIdentifyingField):
-            yield (field_name, getattr(model, field_name))
+    for field_name in type(model).__ormdantic_annotated_identifiers__:
+        yield (field_name, getattr(model, field_name))
 
 
 def allocate_fields_if_empty(model:ModelT, inplace:bool=False, 
                              next_seq: Callable[[str], Any] | None = None) -> ModelT:
+    return _allocate_fields_if_empty(
+        model, type(model).__ormdantic_auto_allocated_fields__, inplace, next_seq)
+
+
+def allocate_fields_if_empty_many(models:Iterable[ModelT], inplace:bool=False,
+                                  next_seq: Callable[[Type, str], Any] | None = None
+                                  ) -> List[ModelT]:
+    ''' allocate_fields_if_empty for multiple models. next_seq will be called 
+        with the type and the field name.
+    '''
+    allocated = []
+    append = allocated.append
+    # next_seq for each type. it is made once for the type, not for every model.
+    next_seqs : Dict[Type, Callable[[str], Any] | None] = {}
+
+    for model in models:
+        model_type = type(model)
+        field_names = model_type.__ormdantic_auto_allocated_fields__
+
+        if not field_names:
+            append(model)
+            continue
+
+        if model_type not in next_seqs:
+            next_seqs[model_type] = functools.partial(next_seq, model_type) if next_seq else None
+
+        append(_allocate_fields_if_empty(model, field_names, inplace, next_seqs[model_type]))
+
+    return allocated
+
+
+def _allocate_fields_if_empty(model:ModelT, field_names:Iterable[str], inplace:bool, 
+                              next_seq: Callable[[str], Any] | None) -> ModelT:
     to_be_updated = None
+    allocate_scalar = _allocate_scalar_value_if_empty_value
+    allocate_vector = _allocate_vector_if_empty_value
 
-    for field_name in type(model).__fields__.keys(): 
+    for field_name in field_names: 
         field_value = getattr(model, field_name)
 
         updated_value = (
-            _allocate_scalar_value_if_empty_value(field_name, field_value, inplace, next_seq) 
-            or _allocate_vector_if_empty_value(field_name, field_value, inplace, next_seq)
+            allocate_scalar(field_name, field_value, inplace, next_seq) 
+            or allocate_vector(field_name, field_value, inplace, next_seq)
         )
 
         if updated_value is not None:
@@ -383,46 +600,69 @@ def _allocate_scalar_value_if_empty_value(field_name:str, obj:Any, inplace:bool,
 def _allocate_vector_if_empty_value(field_name:str, obj:Any, inplace:bool, 
                                    next_seq: Callable[[str], Any] | None = None) -> Any:
     if isinstance(obj, (list, tuple)):
-        if not obj:
+        # most of vectors does not have auto allocated items. don't make lists.
+        if not any(isinstance(item, AutoAllocatedMixin) for item in obj):
             return None
 
-        to_be_updated = None
-
-        for index, item in enumerate(obj):
-            replaced = _allocate_scalar_value_if_empty_value(field_name, item, inplace, next_seq)
+        replaced = [
+            _allocate_scalar_value_if_empty_value(field_name, item, inplace, next_seq)
+            for item in obj
+        ]
 
-            if not to_be_updated and replaced is not None:
-                to_be_updated = list(obj[:index])
-
-            if to_be_updated is not None:
-                to_be_updated.append(replaced)
+        if all(r is None for r in replaced):
+            return None
 
-        if isinstance(obj, tuple) and to_be_updated:
-            to_be_updated = tuple(to_be_updated)
+        merged = [item if r is None else r for r, item in zip(replaced, obj)]
 
-        return to_be_updated
+        return tuple(merged) if isinstance(obj, tuple) else merged
 
     return None
 
 
 def get_stored_fields_for(type_:Type,
                           metadata_or_predicate: Type[T] | Callable[[Tuple[str, ...], Type], bool]
-                          ) -> Dict[str, Tuple[Tuple[str, ...], Type[T]]]:
-    stored = get_stored_fields(type_)
-
+                          ) -> Mapping[str, Tuple[Tuple[str, ...], Type[T]]]:
     if inspect.isfunction(metadata_or_predicate):
-        return {
-            k: (paths, cast(Type[T], type_)) for k, (paths, type_) in stored.items()
-            if metadata_or_predicate(paths, type_)
-        }
+        return get_stored_fields_by_predicate(type_, metadata_or_predicate)
     else:
-        return {
-            k: (paths, cast(Type[T], type_)) for k, (paths, type_) in stored.items()
-            if has_metadata(type_, cast(Type, metadata_or_predicate))
-        }
+        return get_stored_fields_by_metadata(type_, cast(Type[T], metadata_or_predicate))
+
+
+@cache_for_type
+def get_stored_fields_by_metadata(type_:Type, metadata:Type[T]
+                                  ) -> Mapping[str, Tuple[Tuple[str, ...], Type[T]]]:
+    # the result is cached and shared by callers. so, it is read only.
+    return MappingProxyType({
+        k: (paths, cast(Type[T], field_type)) 
+        for k, (paths, field_type) in get_stored_fields(type_).items()
+        if has_metadata(field_type, metadata)
+    })
+
+
+def get_stored_fields_by_predicate(type_:Type, 
+                                   predicate: Callable[[Tuple[str, ...], Type], bool]
+                                   ) -> Dict[str, Tuple[Tuple[str, ...], Type]]:
+    return {
+        k: (paths, field_type) 
+        for k, (paths, field_type) in get_stored_fields(type_).items()
+        if predicate(paths, field_type)
+    }
+
+
+def get_stored_fields(type_:Type) -> Mapping[str, JsonPathAndType]:
+    # the stored fields are decided by the class definition. so, we keep them in 
+    # the class and return it. we do not look up the base class by using __dict__.
+    # it is shared by callers, so it is read only.
+    stored_fields = type_.__dict__.get(_STORED_FIELDS_ATTR)
 
+    if stored_fields is None:
+        stored_fields = MappingProxyType(_build_stored_fields(type_))
+        setattr(type_, _STORED_FIELDS_ATTR, stored_fields)
 
-def get_stored_fields(type_:Type):
+    return stored_fields
+
+
+def _build_stored_fields(type_:Type) -> StoredFieldDefinitions:
     stored_fields : StoredFieldDefinitions = {
         field_name:(_get_json_paths(field_name, field_type), field_type)
         for field_name, field_type in get_field_name_and_type_for_annotated(type_, MetaStoredField)
@@ -430,9 +670,14 @@ def get_stored_fields(type_:Type):
 
     for fields in reversed(
         [cast(PersistentModel, base)._stored_fields
-            for base in inspect.getmro(type_) 
+            for base in type_.__mro__ 
             if is_derived_from(base, PersistentModel)]
     ):
+        # the paths of annotated fields are built by _get_json_paths.
+        # only the paths which are declared in _stored_fields need validation.
+        for paths, _ in fields.values():
+            _validate_json_paths(paths)
+
         stored_fields.update(fields)
 
     adjusted = {}
@@ -440,8 +685,6 @@ def get_stored_fields(type_:Type):
     for field_name, (paths, field_type) in stored_fields.items():
         is_collection_type = is_list_or_tuple_of(field_type)
 
-        _validate_json_paths(paths)
-
         if is_collection_type and paths[-1] != '$' and paths[0] != '..':
             adjusted[field_name] = (paths + ('$',), field_type)
 
@@ -449,13 +692,11 @@ def get_stored_fields(type_:Type):
         
 
 def get_identifying_fields(model_type:Type[PersistentModelT]) -> Tuple[str,...]:
-    stored_fields = get_stored_fields_for(model_type, MetaIdentifyingField)
-
-    return tuple(field_name for field_name, _ in stored_fields.items())
+    return model_type.__ormdantic_identifying_fields__
 
 
 def get_identifying_field_values(model:PersistentModel) -> Dict[str, Any]:
-    return {f:getattr(model, f) for f in get_identifying_fields(type(model))}
+    return {f:getattr(model, f) for f in type(model).__ormdantic_identifying_fields__}
 
 
 def _get_json_paths(field_name, field_type) -> Tuple[str,...]:
@@ -470,7 +711,10 @@ def _get_json_paths(field_name, field_type) -> Tuple[str,...]:
 
 
 def _validate_json_paths(paths:Tuple[str]):
-    if any(not (p == '..' or p.startswith('$.') or p == '$') for p in paths):
+    for p in paths:
+        if p == '..' or p == '$' or (len(p) >= 2 and p[0] == '$' and p[1] == '.'):
+            continue
+
         _logger.fatal(f'{paths} has one item which did not starts with .. or $.')
         raise RuntimeError(L('invalid path expression. the path must start with $. check {0}', paths))
 
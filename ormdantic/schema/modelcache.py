@@ -1,33 +1,79 @@
 from typing import (DefaultDict, Dict, Type, Callable, Tuple, cast, Iterator)
 from collections import defaultdict
+import functools
 
 from ormdantic.schema.base import (
     PersistentModel, PersistentModelT, 
-    get_identifying_field_values, ScalarType
+    get_identifying_fields, ScalarType
 )
 
-from ..util import get_logger, convert_tuple
+from ..util import get_logger, convert_tuple, L
 
 
 _logger = get_logger(__name__)
 
 
+@functools.cache
+def _get_indexed_types(type_:Type) -> Tuple[Type, ...]:
+    # find() is called with the derived types of PersistentModel mostly. 
+    # the other bases like mixins or PersistentModel itself are not indexed.
+    # they are looked up by isinstance.
+    return tuple(t for t in type_.__mro__ if _is_indexed_type(t))
+
+
+@functools.cache
+def _is_indexed_type(type_:Type) -> bool:
+    return type_ is not PersistentModel and issubclass(type_, PersistentModel)
+
+
 class ModelCache():
+    ''' cache of models by identifying values. if max_size is given, the ids 
+        which are least recently registered or found are removed when the 
+        count of ids is over max_size. otherwise, all models are kept and 
+        warning is logged over the threshold.
+    '''
     def __init__(self, threshold:int = 100_000, 
-                 entries: Dict[Tuple[ScalarType, ...], Dict[Type, PersistentModel]] = {}):
-        self._cached : DefaultDict[Tuple[ScalarType,...], Dict[Type, PersistentModel]] = defaultdict(dict)
+                 entries: Dict[Tuple[ScalarType, ...], Dict[Type, PersistentModel]] | None = None,
+                 max_size: int | None = None):
+        if max_size is not None and max_size <= 0:
+            _logger.fatal(f'{max_size=} should be positive. the registered model will be evicted')
+            raise RuntimeError(L('max_size of cache should be greater than 0. check {0}', max_size))
+
+        # plain dict, so a lookup of missing id does not insert an empty entry.
+        self._cached : Dict[Tuple[ScalarType,...], Dict[Type, PersistentModel]] = dict(entries or {})
+        # the first model of each id which is the instance of the type.
+        # find() uses it when the type is not registered as the key.
+        self._by_subtype : DefaultDict[Type, Dict[Tuple[ScalarType,...], PersistentModel]] = defaultdict(dict)
         self._threshold = threshold
+        self._max_size = max_size
 
         if entries:
-            self._cached.update(entries.items())
+            for id_values in entries:
+                self._index(id_values)
 
     def register(self, type_:Type, model:PersistentModel) -> PersistentModel:
-        id_fields = tuple(get_identifying_field_values(model).values())
+        id_fields = tuple(getattr(model, f) for f in get_identifying_fields(type(model)))
+
+        type_and_model = self._cached.get(id_fields)
+
+        if type_and_model is None:
+            type_and_model = self._cached[id_fields] = {}
+        else:
+            self._unindex(id_fields)
 
-        self._cached[id_fields][type_] = model
+        type_and_model[type_] = model
+        self._index(id_fields)
 
         item_count = len(self._cached)
 
+        if self._max_size is not None:
+            self._touch(id_fields)
+
+            if item_count > self._max_size:
+                self._evict(next(iter(self._cached)))
+
+            return model
+
         if item_count >= self._threshold and (item_count - 1) % 100 == 0:
             _logger.warning(f'cache size is over {self._threshold=} {item_count=}')
 
@@ -37,34 +83,84 @@ class ModelCache():
              id_values: ScalarType | Tuple[ScalarType, ...]) -> PersistentModelT | None:
         id_values = convert_tuple(id_values)
 
-        if id_values in self._cached:
-            type_and_model = self._cached[id_values]
+        found = self._find(type_, id_values)
 
-            if type_ in type_and_model:
-                return cast(PersistentModelT, type_and_model[type_])
+        if found is not None and self._max_size is not None:
+            self._touch(id_values)
 
-            for item in type_and_model.values():
-                if isinstance(item, type_):
-                    return item
-        
-        return None
+        # string annotation does not build the Union for every call.
+        return cast('PersistentModelT | None', found)
+
+    def _find(self, type_:Type, id_values:Tuple[ScalarType, ...]) -> PersistentModel | None:
+        # lookup without changing the order of least recently used.
+        type_and_model = self._cached.get(id_values)
+
+        if type_and_model is None:
+            return None
+
+        found = type_and_model.get(type_)
+
+        if found is None:
+            if _is_indexed_type(type_):
+                by_subtype = self._by_subtype.get(type_)
+                found = by_subtype.get(id_values) if by_subtype else None
+            else:
+                found = next(
+                    (m for m in type_and_model.values() if isinstance(m, type_)), None)
+
+        return found
 
     def clear(self):
+        self._by_subtype.clear()
         return self._cached.clear()
 
     def delete(self, type_:Type, id_values:ScalarType | Tuple[ScalarType,...]):
         id_values = convert_tuple(id_values)
 
-        targets = self._cached[id_values]
+        targets = self._cached.get(id_values)
+
+        if targets is None:
+            return
 
         if type_ in targets:
+            self._unindex(id_values)
             targets.pop(type_)
+            self._index(id_values)
         else:
+            found = self._find(type_, id_values)
+
             for key, value in targets.items():
-                if isinstance(value, type_):
+                if value is found:
+                    self._unindex(id_values)
                     targets.pop(key)
+                    self._index(id_values)
                     break
 
+    def _touch(self, id_values:Tuple[ScalarType, ...]):
+        # dict keeps the insertion order. the first one is least recently used.
+        self._cached[id_values] = self._cached.pop(id_values)
+
+    def _evict(self, id_values:Tuple[ScalarType, ...]):
+        self._unindex(id_values)
+        del self._cached[id_values]
+
+    def _index(self, id_values:Tuple[ScalarType, ...]):
+        type_and_model = self._cached[id_values]
+
+        for model in type_and_model.values():
+            for type_ in _get_indexed_types(type(model)):
+                # the registered type is found without index.
+                if type_ not in type_and_model:
+                    self._by_subtype[type_].setdefault(id_values, model)
+
+    def _unindex(self, id_values:Tuple[ScalarType, ...]):
+        for model in self._cached[id_values].values():
+            for type_ in _get_indexed_types(type(model)):
+                by_subtype = self._by_subtype.get(type_)
+
+                if by_subtype is not None:
+                    by_subtype.pop(id_values, None)
+
     def get(self, type_:Type[PersistentModel], 
             id_values: ScalarType | Tuple[ScalarType, ...],
             func: Callable[..., PersistentModel | None]) -> PersistentModel | None:
@@ -84,17 +180,7 @@ class ModelCache():
     def has_entry(self, type_:Type, key:ScalarType | Tuple[ScalarType,...]) -> bool:
         key = convert_tuple(key)
 
-        if key in self._cached:
-            if type_ in self._cached[key]:
-                return True
-            
-            type_and_model = self._cached[key]
-
-            for model in type_and_model.values():
-                if isinstance(model, type_):
-                    return True
-
-        return False
+        return self._find(type_, key) is not None
 
     def iterate_all(self) -> Iterator[PersistentModel]:
         for dicts in self._cached.values():
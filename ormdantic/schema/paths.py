@@ -1,14 +1,17 @@
 import itertools
+import functools
 from typing import (
     Any, Tuple, Type, TypeVar, Iterator, Callable, 
     List, cast, Dict
 )
 import inspect
 
+from pydantic import BaseModel
+
 from ormdantic.util.hints import get_args_of_list_or_tuple
 from ormdantic.util.tools import convert_tuple
 
-from .base import ( ModelT, SchemaBaseModel)
+from .base import ( ModelT, SchemaBaseModel, cache_for_type, get_field_name_and_type)
 from ..util import (
     get_logger, is_derived_from, is_list_or_tuple_of, convert_as_list_or_tuple,
     is_derived_or_collection_of_derived, get_union_type_arguments, L,
@@ -20,47 +23,73 @@ T = TypeVar('T')
 _logger = get_logger(__name__)
 
 
+@cache_for_type
 def get_paths_for(type_:Type, types:Type | Tuple[Type, ...]) -> Tuple[str, ...]:
-    types = convert_tuple(types)
-
-    return tuple(path for path, _ in get_path_and_types_for(type_, 
-        lambda t: any(
-            is_derived_or_collection_of_derived(t, target_type) for target_type in types
-        )
-    ))
+    return tuple(
+        path for path, _ in _build_path_and_types(type_, _build_check(convert_tuple(types)))
+    )
 
 
 def get_path_and_types_for(type_:Type[ModelT], 
                       predicate: Type | Callable[[Type], bool] | None
                       ) -> Iterator[Tuple[str, Type]]:
-    
+    if inspect.isfunction(predicate):
+        # function could be made for every call. so, we don't cache it.
+        yield from _build_path_and_types(type_, predicate)
+    else:
+        yield from _get_path_and_types_for_type(type_, predicate)
+
+
+@cache_for_type
+def _get_path_and_types_for_type(type_:Type[ModelT], 
+                                 target_type: Type | None
+                                 ) -> Tuple[Tuple[str, Type], ...]:
+    return tuple(_build_path_and_types(type_, target_type))
+
+
+def _build_path_and_types(type_:Type[ModelT], 
+                          predicate: Type | Callable[[Type], bool] | None
+                          ) -> Iterator[Tuple[str, Type]]:
     if not is_derived_from(type_, SchemaBaseModel):
         _logger.fatal(f'{type_=} should be subclass of SchemaBaseModel. '
-                      f'check the mro {inspect.getmro(type_)=}')
+                      f'check the mro {type_.__mro__=}')
         raise RuntimeError(L('invalid type {0} for get path and type', type_))
 
-    yield from (('$.' + ('.'.join(paths)), type_) 
-                for paths, type_ in _get_path_and_type(type_, predicate))
+    # decide how to check the field type once, not for every field.
+    if predicate is None or inspect.isfunction(predicate):
+        check = predicate
+    else:
+        check = _build_check((predicate,))
+
+    collected : List[Tuple[Tuple[str, ...], Type]] = []
+    _collect_path_and_type(type_, check, tuple(), collected)
+
+    yield from (('$.' + ('.'.join(paths)), type_) for paths, type_ in collected)
     
 
-def _get_path_and_type(type_:Type[ModelT], 
-                      predicate: Type | Callable[[Type], bool] | None = None,
-                      ) -> Iterator[Tuple[List[str], Type]]:
+def _build_check(types:Tuple[Type, ...]) -> Callable[[Type], bool]:
+    # is_derived_or_collection_of_derived is cached for each type. 
+    # if there is one type, we don't need to iterate types.
+    if len(types) == 1:
+        target_type = types[0]
+        return lambda t: is_derived_or_collection_of_derived(t, target_type)
 
-    assert is_derived_from(type_, SchemaBaseModel)
+    return lambda t: any(
+        is_derived_or_collection_of_derived(t, target_type) for target_type in types
+    )
 
-    for field_name, model_field in type_.__fields__.items():
-        field_type = model_field.outer_type_ 
 
-        if not predicate or (
-            predicate(field_type)
-            if inspect.isfunction(predicate) else 
-            is_derived_or_collection_of_derived(field_type, predicate)
-        ):
-            json_path = []
+def _collect_path_and_type(type_:Type[ModelT], 
+                           check: Callable[[Type], bool] | None,
+                           prefix: Tuple[str, ...],
+                           collected: List[Tuple[Tuple[str, ...], Type]]):
+    assert is_derived_from(type_, SchemaBaseModel)
 
-            json_path.append(field_name)
+    # get_field_name_and_type is cached for the type.
+    for field_name, field_type in get_field_name_and_type(type_):
+        json_path = prefix + (field_name,)
 
+        if check is None or check(field_type):
             if is_list_or_tuple_of(field_type):
                 generic_param = get_args_of_list_or_tuple(field_type)
 
@@ -69,61 +98,98 @@ def _get_path_and_type(type_:Type[ModelT],
 
                 field_type = generic_param
 
-            yield (json_path, field_type)
+            collected.append((json_path, field_type))
 
         if is_derived_from(field_type, SchemaBaseModel):
-            yield from (([field_name] + paths, type_) 
-                for paths, type_ in 
-                _get_path_and_type(field_type, predicate)
-            )
+            _collect_path_and_type(field_type, check, json_path, collected)
         elif (args := get_union_type_arguments(field_type, SchemaBaseModel)):
-            if args:
-                field_type = args[0]
-
-                yield from (([field_name] + paths, type_) 
-                    for paths, type_ in 
-                    _get_path_and_type(field_type, predicate)
-                )
+            _collect_path_and_type(args[0], check, json_path, collected)
         elif is_list_or_tuple_of(field_type, SchemaBaseModel):
             generic_param = get_args_of_list_or_tuple(field_type)
 
             assert not isinstance(generic_param, tuple), "not support heterogeneous type for collection"
 
             if generic_param: 
-                yield from (([field_name] + paths, type_) 
-                    for paths, type_ in 
-                    _get_path_and_type(generic_param, predicate)
-                )
+                _collect_path_and_type(generic_param, check, json_path, collected)
 
 
 def extract(model:SchemaBaseModel | Dict[str, Any], path:str) -> Any:
     current = model
 
-    for field in path.split('.'):
-        if field == '$':
-            current = model
+    for field_name in _parse_path(path):
+        if current is None:
+            return None
+
+        if _is_collection(current):
+            current = tuple(itertools.chain(*(
+                convert_as_list_or_tuple(getattr(item, field_name, tuple()))
+                for item in cast(list, current)
+            )))
+        elif isinstance(current, dict):
+            current = current.get(field_name, None)
         else:
-            if field.endswith('[*]'):
-                field_name = field[:-3]
-            else:
-                field_name = field
-
-            if is_list_or_tuple_of(type(current)):
-                current = tuple(itertools.chain(*(
-                    convert_as_list_or_tuple(getattr(item, field_name, tuple()))
-                    for item in cast(list, current)
-                )))
-            elif current is not None:
-                if isinstance(current, dict):
-                    current = current.get(field_name, None)
-                else:
-                    current = getattr(current, field_name, None)
-            else:
-                return None
+            current = getattr(current, field_name, None)
 
     return current
 
 
+def _is_collection(obj:Any) -> bool:
+    obj_type = type(obj)
+
+    if obj_type is list or obj_type is tuple:
+        return True
+
+    # model is the most common. it does not need to check the generic.
+    if isinstance(obj, (BaseModel, dict, str)):
+        return False
+
+    return is_list_or_tuple_of(obj_type)
+
+
+def iterate_extracted(model:SchemaBaseModel | Dict[str, Any], path:str) -> Iterator[Any]:
+    ''' iterate the values of path like extract. the items of collection are
+        yielded one by one and None is skipped. '''
+    yield from _iterate_extracted(model, _parse_path(path), 0)
+
+
+def _iterate_extracted(current:Any, fields:Tuple[str, ...], index:int) -> Iterator[Any]:
+    for i in range(index, len(fields)):
+        if current is None:
+            return
+
+        if _is_collection(current):
+            for item in current:
+                yield from _iterate_extracted(item, fields, i)
+            return
+        elif isinstance(current, dict):
+            current = current.get(fields[i], None)
+        else:
+            current = getattr(current, fields[i], None)
+
+    if current is None:
+        return
+
+    if _is_collection(current):
+        yield from (item for item in current if item is not None)
+    else:
+        yield current
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_path(path:str) -> Tuple[str, ...]:
+    # the field names which should be looked up from the model.
+    # '$' is the model, so the fields before the last '$' are not needed.
+    # '[*]' does not change the result, so it is dropped.
+    fields = path.split('.')
+
+    if '$' in fields:
+        fields = fields[len(fields) - fields[::-1].index('$'):]
+
+    return tuple(
+        field[:-3] if field.endswith('[*]') else field for field in fields
+    )
+
+
 def extract_as(model:SchemaBaseModel, path:str, target_type_:Type[T]) -> T | Tuple[T] | None:
     data = extract(model, path)
 
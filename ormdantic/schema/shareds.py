@@ -1,7 +1,7 @@
 import inspect
 from typing import (
-    ClassVar, Dict, Generic, Iterator, Iterator, TypeVar, get_args, Union, Type, 
-    Set, DefaultDict, Any, cast, Tuple, List, Set, Callable, Annotated
+    ClassVar, Dict, Generic, Iterator, TypeVar, get_args, Union, Type, 
+    Set, DefaultDict, Any, cast, Tuple, Callable, Annotated
 )
 from pydantic import Field, PrivateAttr
 from collections import defaultdict
@@ -12,16 +12,16 @@ from ormdantic.util.hints import (
 )
 
 from ..util import (
-    digest, convert_as_list_or_tuple, get_logger, get_base_generic_alias_of, 
-    is_derived_from, unique, L,
+    digest, get_logger, get_base_generic_alias_of, 
+    unique, L,
 )
 
 from .base import (
     UuidStr, PersistentModel,  PersistentModelT, 
-    register_class_preprocessor, orjson_dumps, SchemaBaseModel,
-    MetaIdentifyingField
+    register_class_preprocessor, orjson_dumps_bytes, SchemaBaseModel,
+    MetaIdentifyingField, cache_for_type
 )
-from .paths import (extract_as, get_path_and_types_for, get_paths_for)
+from .paths import (iterate_extracted, get_path_and_types_for, get_paths_for)
 
 
 _logger = get_logger(__name__)
@@ -56,7 +56,8 @@ class SharedContentMixin(SchemaBaseModel):
 def _get_content_id(content:Dict[str, Any]) -> str:
     content.pop('id', None)
 
-    return digest(orjson_dumps(content), 'sha1')
+    # orjson returns bytes. digest it without decoding.
+    return digest(orjson_dumps_bytes(content), 'sha1')
 
 
 SharedContentModelT = TypeVar('SharedContentModelT', bound=SharedContentMixin)
@@ -104,14 +105,13 @@ def _update_annotation_for_shared_content(name:str,
 register_class_preprocessor(_ReferenceMarker, _update_annotation_for_shared_content)
 
 
-def _is_inherit_from_content_reference_model(bases:Tuple[Type,...]) -> bool:
-    for base in bases:
-        # we could not use ContentReferenceModel here becuase it does not setted.
-        # so check the name and module.
-        if base.__module__ == __name__ and base.__qualname__ == 'ContentReferenceModel':
-            return True
+# we could not use ContentReferenceModel in the preprocessor before it is 
+# defined. it will be added after the class is created.
+_content_reference_bases : Set[Type] = set()
+
 
-    return False
+def _is_inherit_from_content_reference_model(bases:Tuple[Type,...]) -> bool:
+    return any(base in _content_reference_bases for base in bases)
 
 
 LazyLoader = Callable[[str], 'SharedContentMixin']  
@@ -123,19 +123,7 @@ class ContentReferenceModel(SchemaBaseModel,
     _lazy_loader : LazyLoader | None = PrivateAttr(default=None)
 
     def get_content_type(self) -> Type:
-        arguments = get_union_type_arguments(self.__fields__['content'].outer_type_)
-        assert arguments
-
-        content_type = arguments[0]
-
-        if not inspect.isclass(content_type):
-            _logger.fatal(f'{content_type=} is not general class. if it is TypeVar, '
-                'you should declare class which derived from ContentReferenceModel. '
-                'do not use ContentReferenceModel directly. we could not know what '
-                'is the real class for content')
-            raise RuntimeError(L('do not use ContentReferenceModel directly. check {0}', content_type.__name__))
-
-        return content_type
+        return _get_content_type(type(self))
 
     def get_content_id(self) -> str:
         return self.content if isinstance(self.content, str) else self.content.id
@@ -157,6 +145,26 @@ class ContentReferenceModel(SchemaBaseModel,
         title = 'base object which can be saved or retreived by content'
 
 
+_content_reference_bases.add(ContentReferenceModel)
+
+
+@cache_for_type
+def _get_content_type(type_:Type[ContentReferenceModel]) -> Type:
+    arguments = get_union_type_arguments(type_.__fields__['content'].outer_type_)
+    assert arguments
+
+    content_type = arguments[0]
+
+    if not inspect.isclass(content_type):
+        _logger.fatal(f'{content_type=} is not general class. if it is TypeVar, '
+            'you should declare class which derived from ContentReferenceModel. '
+            'do not use ContentReferenceModel directly. we could not know what '
+            'is the real class for content')
+        raise RuntimeError(L('do not use ContentReferenceModel directly. check {0}', content_type.__name__))
+
+    return content_type
+
+
 class SharedContentModel(SharedContentMixin):
     pass
 
@@ -165,15 +173,24 @@ class PersistentSharedContentModel(SharedContentMixin, PersistentModel):
     pass
 
 
+@cache_for_type
 def get_shared_content_types(model_type:Type) -> Tuple[Type]:
     return tuple(
         unique(
-            get_args_of_base_generic_alias(field_type, ContentReferenceModel)[0]
-            for _, field_type in get_path_and_types_for(model_type, ContentReferenceModel) 
+            content_type 
+            for _, content_type in _get_reference_paths_and_content_types(model_type)
         )
     )
 
 
+@cache_for_type
+def _get_reference_paths_and_content_types(model_type:Type) -> Tuple[Tuple[str, Type], ...]:
+    return tuple(
+        (path, get_args_of_base_generic_alias(field_type, ContentReferenceModel)[0])
+        for path, field_type in get_path_and_types_for(model_type, ContentReferenceModel) 
+    )
+
+
 def extract_shared_models(model: PersistentModel,
                           replace_with_id: bool = False
                           ) -> DefaultDict[str, Dict[Type, SharedContentMixin]]:
@@ -201,17 +218,20 @@ def extract_shared_models_for(model: PersistentModel,
     shared_models : Dict[str, SharedContentModelT] = dict()
 
     for shared_model in _iterate_content_reference_models(model):
-        content = cast(SharedContentMixin, shared_model.content)
+        content = shared_model.content
 
-        if is_derived_from(type(content), target_type):
+        # isinstance narrows the type of content, so cast is not required.
+        if isinstance(content, target_type):
             content.refresh_id()
 
-            if content.id in shared_models:
-                if type(shared_models[content.id]) is not type(content):
+            existed = shared_models.get(content.id)
+
+            if existed is not None:
+                if type(existed) is not type(content):
                     _logger.fatal(f'{content=} has different type but has same {content.id=}')
                     raise RuntimeError(L('cannot support the contents of different type which have same id. id was {0}', content.id))
 
-            shared_models[content.id] = cast(SharedContentModelT, content)
+            shared_models[content.id] = content
 
             if replace_with_id:
                 shared_model.content = content.id
@@ -220,7 +240,8 @@ def extract_shared_models_for(model: PersistentModel,
 
 
 def has_shared_models(model:PersistentModel) -> bool:
-    return any(get_paths_for(type(model), ContentReferenceModel))
+    # get_paths_for is cached for the type.
+    return bool(get_paths_for(type(model), ContentReferenceModel))
 
 
 def populate_shared_models(model:PersistentModelT, 
@@ -229,28 +250,42 @@ def populate_shared_models(model:PersistentModelT,
     # contents {'1a2221adef12':{field_type:model_object}}
     # we should iterate all item which has same id for checking derived type.
 
-    if _has_to_be_populated(model):
-        model = model.copy(deep=True)
+    # model which has no id only reference does not need the second traversal.
+    if not _has_to_be_populated(model):
+        return model
+
+    model = model.copy(deep=True)
+
+    # same content can be referenced many times. find and populate it once.
+    populated : Dict[Tuple[Type, str], SharedContentMixin] = {}
 
     for reference_model in _iterate_content_reference_models(model):
         content = reference_model.content
 
         if isinstance(content, str):
-            for model_set in model_sets:
-                matched_models = model_set.find(reference_model.get_content_type(), content)
-
-                if matched_models:
-                    # if shared model has a nested shared model we will populate it.
-                    matched_models = populate_shared_models(matched_models, model_set)
-                    reference_model.content = matched_models
-                    break
-            else:
-                _logger.fatal(f'cannot load shared model from cache {content=}, {model_sets=}')
-                raise RuntimeError(L('cannot populate shared model.'))
+            key = (reference_model.get_content_type(), content)
+
+            if key not in populated:
+                populated[key] = _find_and_populate(key[0], content, model_sets)
+
+            reference_model.content = populated[key]
 
     return model
 
 
+def _find_and_populate(content_type:Type, content_id:str, 
+                       model_sets: Tuple[ModelCache, ...]) -> SharedContentMixin:
+    for model_set in model_sets:
+        matched_models = model_set.find(content_type, content_id)
+
+        if matched_models:
+            # if shared model has a nested shared model we will populate it.
+            return populate_shared_models(matched_models, model_set)
+
+    _logger.fatal(f'cannot load shared model from cache {content_id=}, {model_sets=}')
+    raise RuntimeError(L('cannot populate shared model.'))
+
+
 def iterate_isolated_models(model:PersistentModel
                                     ) -> Iterator[PersistentModel]:
     has_shared = has_shared_models(model)
@@ -281,29 +316,22 @@ def collect_shared_model_field_type_and_ids(
 
     # ignore that model is ContentReferenceModel 
 
-    for path, field_type in get_path_and_types_for(type(model), ContentReferenceModel):
-        ref_type = get_args_of_base_generic_alias(field_type, ContentReferenceModel)[0]
-
-        for sharedModel in convert_as_list_or_tuple(
-                extract_as(model, path, ContentReferenceModel)
-                or cast(List[ContentReferenceModel], [])):
-            type_and_ids[ref_type].add(sharedModel.get_content_id())
+    for path, ref_type in _get_reference_paths_and_content_types(type(model)):
+        type_and_ids[ref_type].update(
+            shared_model.get_content_id() 
+            for shared_model in iterate_extracted(model, path)
+            if isinstance(shared_model, ContentReferenceModel)
+        )
 
     return type_and_ids
  
 
 def _iterate_content_reference_models(
         model: PersistentModel) -> Iterator[ContentReferenceModel]:
-    model_type = type(model)
-
-    # if is_derived_from(model_type, ContentReferenceModel):
-    #     yield cast(ContentReferenceModel, model)
-
-    for path in get_paths_for(model_type, ContentReferenceModel) :
-        for shared_model in convert_as_list_or_tuple(
-                extract_as(model, path, ContentReferenceModel)
-                or cast(List[ContentReferenceModel], [])):
-            yield shared_model
+    # the paths are same with _iterate_content_reference_models_and_type.
+    # share one traversal for both.
+    for shared_model, _ in _iterate_content_reference_models_and_type(model):
+        yield shared_model
 
 
 def _iterate_content_reference_models_and_type(
@@ -314,7 +342,6 @@ def _iterate_content_reference_models_and_type(
     #     yield cast(ContentReferenceModel, model), model_type
 
     for path, type_ in get_path_and_types_for(model_type, ContentReferenceModel) :
-        for shared_model in convert_as_list_or_tuple(
-                extract_as(model, path, ContentReferenceModel)
-                or cast(List[ContentReferenceModel], [])):
-            yield shared_model, type_
+        for shared_model in iterate_extracted(model, path):
+            if isinstance(shared_model, ContentReferenceModel):
+                yield shared_model, type_
@@ -12,7 +12,7 @@ from ..util import get_logger, is_derived_from, L
 
 from .typed import parse_object_for_model
 from .base import (
-    PersistentModelT, PersistentModel, allocate_fields_if_empty, 
+    PersistentModelT, PersistentModel, allocate_fields_if_empty_many, 
     get_identifying_fields, get_stored_fields, ScalarType
 )
 from .shareds import (
@@ -30,6 +30,11 @@ _SourceT = TypeVar('_SourceT', bound='ModelSource')
 NormalizedQueryConditionType = Dict[str, Tuple[str, Any]]
 QueryConditionType = Dict[str, Tuple[str, Any] | ScalarType]
 
+ModelMapKey = FrozenSet[Tuple[str, Any]]
+# the keys which has (field, value). dict is used as ordered set for keeping
+# the order of stored models.
+ModelMapPostings = DefaultDict[Tuple[str, Any], Dict[ModelMapKey, None]]
+
 class SharedModelSource:
     ''' Usually, shared model is not different by version or ref_date. So we
         don't need version and ref_date. 
@@ -468,7 +473,7 @@ class MemoryModelStorage(ModelStorage):
         for model in model_sets[0]:
             self._cache.register(type(model), model)
 
-        self._model_maps = _build_model_maps(model_sets[0])
+        self._model_maps, self._postings = _build_model_maps(model_sets[0])
 
     def __reduce__(self):
         return (MemoryModelStorage, 
@@ -501,7 +506,7 @@ class MemoryModelStorage(ModelStorage):
 
         targets = self._model_maps[type_]
 
-        keys = _find_matched_keys(targets, frozenset(key_and_values))
+        keys = _find_matched_keys(targets, self._postings[type_], frozenset(key_and_values))
 
         for key in keys:
             yield {f:v for f, v in targets[key].items() if not fields or f in fields}
@@ -519,9 +524,7 @@ class MemoryModelStorage(ModelStorage):
 
         saved = []
 
-        for model in models:
-            model = allocate_fields_if_empty(model)
-
+        for model in allocate_fields_if_empty_many(models):
             model._before_save()
 
             for sub_model in iterate_isolated_models(model):
@@ -531,9 +534,8 @@ class MemoryModelStorage(ModelStorage):
                         shared_source.store(sub_model)
                 else:
                     self._cache.register(type(model), model)
-                    model_dict = model.dict()
-
-                    self._model_maps[type(model)][_build_model_map_key(type(model), model_dict)] = model_dict
+                    _add_model_map(self._model_maps[type(model)], 
+                                   self._postings[type(model)], model)
 
             saved.append(model)
 
@@ -549,16 +551,17 @@ class MemoryModelStorage(ModelStorage):
                 if isinstance(shared_source, MemorySharedModelSource):
                     shared_source.delete(type_, next(iter(identified.values())))
         else:
-            for identified in identifieds:
-                targets = self._model_maps[type_]
+            targets = self._model_maps[type_]
+            postings = self._postings[type_]
 
+            for identified in identifieds:
                 self._cache.delete(type_, *identified.values())
 
                 key_and_values = frozenset(identified.items())
-                keys = _find_matched_keys(targets, key_and_values)
+                keys = _find_matched_keys(targets, postings, key_and_values)
 
                 for key in keys:
-                    targets.pop(key)
+                    _remove_model_map(targets, postings, key)
 
     def purge(self, type_:Type, query_condition:QueryConditionType, version_info:VersionInfo):
         self.delete(type_, query_condition, version_info)
@@ -596,24 +599,66 @@ def to_normalize_query_condition(query_condition:QueryConditionType) -> Normaliz
     }
 
 
-def _build_model_maps(models:List[PersistentModel]):
-    model_maps: DefaultDict[Type, Dict[FrozenSet[Tuple[str, Any]], Dict[str, Any]]] = defaultdict(dict)
+def _build_model_maps(models:List[PersistentModel]
+                      ) -> Tuple[DefaultDict[Type, Dict[ModelMapKey, Dict[str, Any]]],
+                                 DefaultDict[Type, ModelMapPostings]]:
+    model_maps: DefaultDict[Type, Dict[ModelMapKey, Dict[str, Any]]] = defaultdict(dict)
+    postings: DefaultDict[Type, ModelMapPostings] = defaultdict(_new_postings)
 
     for model in models:
         model_type = type(model)
-        model_dict = model.dict()
 
-        model_maps[model_type][_build_model_map_key(model_type, model_dict)] = model_dict
+        _add_model_map(model_maps[model_type], postings[model_type], model)
+
+    return model_maps, postings
+
+
+def _new_postings() -> ModelMapPostings:
+    return defaultdict(dict)
+
+
+def _add_model_map(targets:Dict[ModelMapKey, Dict[str, Any]], 
+                   postings:ModelMapPostings,
+                   model:PersistentModel):
+    model_dict = model.dict()
+    key = _build_model_map_key(type(model), model_dict)
+
+    targets[key] = model_dict
+
+    for key_and_value in key:
+        postings[key_and_value][key] = None
+
+
+def _remove_model_map(targets:Dict[ModelMapKey, Dict[str, Any]], 
+                      postings:ModelMapPostings,
+                      key:ModelMapKey):
+    targets.pop(key)
+
+    for key_and_value in key:
+        keys = postings[key_and_value]
+        keys.pop(key, None)
+
+        if not keys:
+            postings.pop(key_and_value)
+
 
-    return model_maps
+def _find_matched_keys(targets:Dict[ModelMapKey, Any], 
+                       postings:ModelMapPostings,
+                       key_and_values: ModelMapKey) -> List[ModelMapKey]:
+    if not key_and_values:
+        return list(targets.keys())
 
+    # the smallest posting has all matched keys. other conditions are checked 
+    # for the keys in it only.
+    candidates = min(
+        (postings.get(key_and_value, {}) for key_and_value in key_and_values), 
+        key=len
+    )
 
-def _find_matched_keys(targets:Dict[FrozenSet[Tuple[str, Any]], Any], 
-                       key_and_values: FrozenSet[Tuple[str, Any]]) -> List[FrozenSet]:
-    return [key for key in targets.keys() if key_and_values <= key]
+    return [key for key in candidates if key_and_values <= key]
 
 
-def _build_model_map_key(model_type:Type, model_dict:Dict[str, Any]) -> FrozenSet[Tuple[str, Any]]:
+def _build_model_map_key(model_type:Type, model_dict:Dict[str, Any]) -> ModelMapKey:
     key = []
 
     for field, (paths, _) in get_stored_fields(model_type).items():
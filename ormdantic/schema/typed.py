@@ -139,7 +139,7 @@ def _parse_obj(obj:Any, target_type:Type) -> Any:
 
 def get_type_for_table(type_:Type) -> Type:
     if is_derived_from(type_, BaseClassTableModel):
-        for base in inspect.getmro(type_):
+        for base in type_.__mro__:
             if BaseClassTableModel in base.__bases__ and is_derived_from(base, PersistentModel):
                 return base
 
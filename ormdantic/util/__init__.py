@@ -4,7 +4,7 @@ from .localized import L
 from .hints import (
     get_base_generic_alias_of, get_args_of_base_generic_alias,
     get_type_args,
-    get_mro_with_generic, update_forward_refs_in_generic_base,
+    get_mro_with_generic, update_forward_refs_in_generic_base, has_forward_ref,
     is_derived_from, is_list_or_tuple_of, resolve_forward_ref,
     resolve_forward_ref_in_args, is_derived_or_collection_of_derived,
     get_union_type_arguments, has_metadata, get_metadata_for
@@ -23,6 +23,7 @@ __all__ = [
     'get_mro_with_generic',
     "get_union_type_arguments",
     'update_forward_refs_in_generic_base',
+    'has_forward_ref',
     'is_derived_from',
     'is_list_or_tuple_of',
     'is_derived_or_collection_of_derived',
@@ -2,10 +2,9 @@ from types import UnionType
 from typing import (
     TypeGuard, get_args, Type, get_origin, Tuple, Any, Generic, Protocol,
     ForwardRef, Dict, Generic, Union, TypeVar, List, Tuple, overload,
-    Annotated
+    Annotated, Callable, cast
 )
 from typing_extensions import _collect_type_vars # type: ignore
-from inspect import getmro
 import sys
 import copy
 import functools
@@ -20,6 +19,30 @@ from .tools import convert_tuple
 
 _logger = get_logger(__name__)
 
+_F = TypeVar('_F', bound=Callable)
+
+
+def _cache_if_hashable(func:_F) -> _F:
+    ''' functools.cache which calls func without cache if the arguments are not
+        hashable like Annotated[int, {'k': 1}]. '''
+    cached = functools.cache(func)
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        try:
+            return cached(*args)
+        except TypeError:
+            try:
+                hash(args)
+            except TypeError:
+                return func(*args)
+
+            raise
+
+    setattr(wrapper, 'cache_clear', cached.cache_clear)
+
+    return cast(_F, wrapper)
+
 #@functools.cache
 def get_base_generic_alias_of(type_:Type, *generic_types:Type) -> Type | None:
     generic_types = convert_tuple(generic_types)
@@ -68,7 +91,7 @@ def _generic_mro(result, tp):
             _generic_mro(result, base)
 
 
-@functools.cache
+@_cache_if_hashable
 def get_mro_with_generic(tp:Type):
     origin = get_origin(tp)
 
@@ -85,6 +108,19 @@ def get_mro_with_generic(tp:Type):
     return tuple(result.get(sub_cls, sub_cls) for sub_cls in mro)
 
 
+@_cache_if_hashable
+def has_forward_ref(type_:Type) -> bool:
+    if type_.__class__ is ForwardRef:
+        return True
+
+    # the parameters of Callable are given as list.
+    return any(
+        has_forward_ref(a) 
+        for arg in get_args(type_) 
+        for a in (arg if isinstance(arg, list) else (arg,))
+    )
+
+
 def update_forward_refs_in_generic_base(type_:Type, localns:Dict[str, Any]):
     # convert ForwardRef as resolved class in __orig_bases__ in base classes
     # if class is derived from generic, it has __orig_bases__ attribute
@@ -130,6 +166,11 @@ def is_derived_from(type_:Type, base_type:Tuple[Type,...]) -> bool:
     ...
 
 def is_derived_from(type_:Type, base_type:Type[_T] | Tuple[Type,...]) -> TypeGuard[Type[_T]] | bool:
+    return _is_derived_from(type_, convert_tuple(base_type))
+
+
+@_cache_if_hashable
+def _is_derived_from(type_:Type, base_types:Tuple[Type,...]) -> bool:
     # if first argument is not class, the issubclass throw the exception.
     # but usually, we don't need the exception. 
     # we just want to know whether the type is derived or not.
@@ -138,8 +179,6 @@ def is_derived_from(type_:Type, base_type:Type[_T] | Tuple[Type,...]) -> TypeGua
     #
     # https://stackoverflow.com/questions/49171189/whats-the-correct-way-to-check-if-an-object-is-a-typing-generic
 
-    base_types = convert_tuple(base_type)
-
     if type_ in base_types:
         return True
 
@@ -147,18 +186,19 @@ def is_derived_from(type_:Type, base_type:Type[_T] | Tuple[Type,...]) -> TypeGua
         origin_type = get_origin(type_)
 
         if origin_type == Annotated:
-            return is_derived_from(type_.__origin__, base_type)
+            return _is_derived_from(type_.__origin__, base_types)
 
         if origin_type in base_types:
             return True
 
     if hasattr(type_, '__mro__'):
         # Union does not have __mro__ attribute
-        return any(t in base_types for t in getmro(type_))
+        return any(t in base_types for t in type_.__mro__)
 
     return False
 
 
+@_cache_if_hashable
 def has_metadata(type_:Type, meta_type:Type) -> bool:
 
     if hasattr(type_, '__metadata__'):
@@ -202,6 +242,7 @@ def get_union_type_arguments(type_:Type, target_type:Type | None = None) -> Tupl
     return None
 
 
+@_cache_if_hashable
 def is_list_or_tuple_of(type_:Type, *parameters:Type) -> bool:
     args = get_args_of_list_or_tuple(type_)
 
@@ -223,12 +264,12 @@ def is_list_or_tuple_of(type_:Type, *parameters:Type) -> bool:
         return is_derived_from(args, parameters[0])
 
 
-@functools.cache
+@_cache_if_hashable
 def is_derived_or_collection_of_derived(type_:Type, param_type_:Type):
     return is_derived_from(type_, param_type_) or is_list_or_tuple_of(type_, param_type_) 
 
 
-@functools.cache
+@_cache_if_hashable
 def get_args_of_list_or_tuple(type_:Type) -> Type | Tuple[Type,...] | None:
     ''' return args from type.
         if list, return Type or empty tuple
@@ -33,17 +33,18 @@ def unique(items:Iterable[T]) -> Iterator[T]:
             yield item
 
 
-def digest(item:str|BaseModel, algorithm:str = 'sha1') -> str:
+def digest(item:str|bytes|BaseModel, algorithm:str = 'sha1') -> str:
     if isinstance(item, BaseModel):
-        return digest_str(item.json())
+        return digest_str(item.json(), algorithm)
+    elif isinstance(item, bytes):
+        return digest_bytes(item, algorithm)
     else:
-        return digest_str(item)
+        return digest_str(item, algorithm)
 
 
 def digest_str(item:str, algorithm:str = 'sha1') -> str:
-    h = hashlib.new(algorithm)
+    return digest_bytes(item.encode('utf-8'), algorithm)
 
-    h.update(item.encode('utf-8'))
-
-    return h.hexdigest()
 
+def digest_bytes(item:bytes, algorithm:str = 'sha1') -> str:
+    return hashlib.new(algorithm, item).hexdigest()
@@ -1,8 +1,8 @@
-from typing import Any, cast, List, Tuple, Type, Annotated
+from typing import Any, NewType, cast, List, Tuple, Type, Annotated
 import uuid
 
 import pytest
-from pydantic import ConstrainedStr, parse_raw_as
+from pydantic import ConstrainedStr, Field, parse_raw_as
 
 from ormdantic.schema import (
     IdentifiedModel
@@ -15,9 +15,12 @@ from ormdantic.schema.base import (
     is_field_list_or_tuple_of, get_field_type,
     get_root_container_type, get_field_name_and_type_for_annotated,
     MetaStoredField, MetaIndexField, MetaIdentifyingField,
-    get_stored_fields_for
+    get_stored_fields_for, update_forward_refs, allocate_fields_if_empty_many,
+    SequenceStr, get_stored_fields, orjson_dumps,
+    get_stored_fields_by_metadata, get_stored_fields_by_predicate
 )
 from ormdantic.schema.typed import (BaseClassTableModel, get_type_for_table)
+from ormdantic.util import get_metadata_for
 
 def test_identified_model():
     model = IdentifiedModel(id=UuidStr(uuid.UUID(int=0).hex), version='0.0.0')
@@ -27,6 +30,43 @@ def test_identified_model():
     assert model == parse_raw_as(type(model), data.encode())
 
 
+def test_json_bytes():
+    model = IdentifiedModel(id=UuidStr(uuid.UUID(int=0).hex), version='0.0.0')
+
+    data = model.json_bytes()
+
+    assert data == model.json().encode()
+    assert model == parse_raw_as(type(model), data)
+
+
+def test_orjson_dumps_non_str_keys():
+    with pytest.raises(TypeError):
+        orjson_dumps({1:'a'})
+
+
+def test_meta_field_compares_values():
+    assert MetaIndexField() == MetaIndexField()
+    assert MetaIndexField(10) != MetaIndexField(20)
+    assert MetaIndexField() != MetaStoredField()
+    assert 10 == get_metadata_for(Annotated[str, MetaIndexField(10)], MetaIndexField).max_length
+    assert 20 == get_metadata_for(Annotated[str, MetaIndexField(20)], MetaIndexField).max_length
+
+
+def test_get_container_type_after_update_forward_refs():
+    class Part(PersistentModel, PartOfMixin['Container']):
+        pass
+
+    assert 'Container' == cast(Any, get_container_type(Part)).__forward_arg__
+
+    class Container(PersistentModel):
+        parts: List[Part]
+
+    update_forward_refs(Part, locals())
+
+    assert Container is get_container_type(Part)
+    assert Container is get_root_container_type(Part)
+
+
 def test_get_container_type():
     class Container(PersistentModel):
         pass
@@ -67,11 +107,39 @@ def test_get_stored_fields_for():
         'identifying':(('$.identifying',), Annotated[str, MetaIdentifyingField()]),
         } == get_stored_fields_for(Container, MetaStoredField)
 
+    assert {
+        'index':(('$.index',), Annotated[str, MetaIndexField()]),
+        } == get_stored_fields_by_metadata(Container, MetaIndexField)
+
+    assert {
+        'stored':(('$.stored',), Annotated[str, MetaStoredField()]),
+        } == get_stored_fields_by_predicate(Container, lambda paths, _: paths == ('$.stored',))
+
+    # cached results are shared. they could not be changed by caller.
+    with pytest.raises(TypeError):
+        cast(Any, get_stored_fields_by_metadata(Container, MetaIndexField))['index'] = None
+
+    with pytest.raises(TypeError):
+        del cast(Any, get_stored_fields(Container))['stored']
+
     with pytest.raises(RuntimeError, match='.*invalid*'):
         get_field_type(cast(Type[Container], str), 'name')
 
   
 
+def test_get_stored_fields_after_update_forward_refs():
+    class Container(PersistentModel):
+        name: 'MyIndex'
+
+    MyIndex = Annotated[str, MetaIndexField()]
+
+    assert {} == get_stored_fields(Container)
+
+    update_forward_refs(Container, locals())
+
+    assert {'name': (('$.name',), MyIndex)} == get_stored_fields(Container)
+
+
 def test_get_field_type():
     class Container(PersistentModel):
         name:str
@@ -102,6 +170,20 @@ def test_get_part_field_name():
     assert ('part1', 'part2') == get_field_names_for(MultipleFieldsContainer, Part)
 
 
+def test_get_field_names_for_after_update_forward_refs():
+    class Container(PersistentModel):
+        parts: List['Part']
+
+    class Part(PersistentModel, PartOfMixin[Container]):
+        pass
+
+    assert tuple() == get_field_names_for(Container, Part)
+
+    update_forward_refs(Container, locals())
+
+    assert ('parts',) == get_field_names_for(Container, Part)
+
+
 def test_get_field_name_and_type():
     class Part(PersistentModel, PartOfMixin['Container']):
         pass
@@ -159,6 +241,17 @@ def test_get_identifier_of():
     assert {'id':'00000000000000000000000000000000'} == dict(get_identifer_of(model))
 
 
+def test_get_identifier_of_after_update_forward_refs():
+    class SimpleModel(PersistentModel):
+        id: 'IdStr' = UuidStr(uuid.UUID(int=0).hex)
+
+    IdStr = Annotated[UuidStr, MetaIdentifyingField()]
+
+    update_forward_refs(SimpleModel, locals())
+
+    assert {'id':'00000000000000000000000000000000'} == dict(get_identifer_of(SimpleModel()))
+
+
 def test_is_fields_collection_type():
     class SimpleModel(PersistentModel):
         list_id: List[str]
@@ -207,6 +300,87 @@ def test_allocate_fields_if_empty_for_vector():
     assert replaced.empty_ids is model.empty_ids
 
 
+def test_allocate_fields_if_empty_for_vector_keeps_allocated():
+    class SimpleModel(PersistentModel):
+        list_ids : List[UuidStr] 
+
+    model = SimpleModel(list_ids=[UuidStr('a'), UuidStr(''), UuidStr('b')])
+
+    replaced = allocate_fields_if_empty(model)
+
+    assert 'a' == replaced.list_ids[0]
+    assert replaced.list_ids[1]
+    assert 'b' == replaced.list_ids[2]
+
+
+def test_allocate_fields_if_empty_for_optional():
+    class SimpleModel(PersistentModel):
+        name : str
+        code : SequenceStr | None
+
+    model = SimpleModel(name='', code=SequenceStr(''))
+
+    replaced = allocate_fields_if_empty(model, next_seq=lambda f: 1)
+
+    assert ('code',) == SimpleModel.__ormdantic_auto_allocated_fields__
+    assert replaced.code == 'N1'
+
+
+def test_auto_allocated_fields_with_new_type():
+    NewStr = NewType('NewStr', str)
+
+    class SimpleModel(PersistentModel):
+        name : NewStr
+        alias : NewStr | None
+        value : Any
+        code : SequenceStr | None
+
+    assert ('code',) == SimpleModel.__ormdantic_auto_allocated_fields__
+
+
+def test_auto_allocated_fields_with_annotated_new_type():
+    NewStr = NewType('NewStr', str)
+
+    class SimpleModel(PersistentModel):
+        name : Annotated[NewStr, Field(description='doc')]
+        code : Annotated[SequenceStr, Field(description='doc')]
+
+    assert ('code',) == SimpleModel.__ormdantic_auto_allocated_fields__
+
+    model = allocate_fields_if_empty(
+        SimpleModel(name=NewStr('name'), code=SequenceStr('')), next_seq=lambda f: 1)
+
+    assert 'name' == model.name
+    assert 'N1' == model.code
+
+
+def test_allocate_fields_if_empty_many():
+    class SimpleModel(IdentifiedModel):
+        pass
+
+    class SequenceModel(PersistentModel):
+        code: SequenceStr
+
+    models = [
+        SimpleModel(id=UuidStr(''), version=''), 
+        SequenceModel(code=SequenceStr('')),
+        SimpleModel(id=UuidStr('1'), version=''), 
+    ]
+
+    called = []
+
+    def next_seq(type_, field_name):
+        called.append((type_, field_name))
+        return 1
+
+    replaced = allocate_fields_if_empty_many(models, next_seq=next_seq)
+
+    assert replaced[0] is not models[0] and replaced[0].id
+    assert replaced[1].code == 'N1'
+    assert replaced[2] is models[2]
+    assert [(SequenceModel, 'code')] == called
+
+
 def test_get_type_for_table():
     class TableModel(BaseClassTableModel, PersistentModel):
         pass
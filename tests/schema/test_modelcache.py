@@ -63,3 +63,54 @@ def test_has_entry(model_cache:ModelCache):
     assert model_cache.has_entry(MyCachedDerivedModel, derived_model.id)
     assert model_cache.has_entry(MyCachedBaseModel, derived_model.id)
 
+
+
+def test_find_by_base_type(model_cache:ModelCache):
+    assert derived_model == model_cache.find(PersistentSharedContentModel, derived_model.id)
+    assert table_model == model_cache.find(MyCachedDerivedModel, table_model.id)
+
+    model_cache.delete(MyCachedDerivedModel, table_model.id)
+
+    assert None is model_cache.find(MyCachedDerivedModel, table_model.id)
+    assert None is model_cache.find(PersistentSharedContentModel, table_model.id)
+
+
+def test_max_size():
+    first = MyCachedBaseModel(name='first')
+    second = MyCachedBaseModel(name='second')
+    third = MyCachedBaseModel(name='third')
+
+    cache = ModelCache(max_size=2)
+
+    cache.register(MyCachedBaseModel, first)
+    cache.register(MyCachedBaseModel, second)
+
+    assert first is cache.find(MyCachedBaseModel, first.id)
+
+    cache.register(MyCachedBaseModel, third)
+
+    assert first is cache.find(MyCachedBaseModel, first.id)
+    assert None is cache.find(MyCachedBaseModel, second.id)
+    assert None is cache.find(PersistentSharedContentModel, second.id)
+    assert third is cache.find(PersistentSharedContentModel, third.id)
+
+
+def test_max_size_does_not_touch_by_has_entry():
+    first = MyCachedBaseModel(name='first')
+    second = MyCachedBaseModel(name='second')
+    third = MyCachedBaseModel(name='third')
+
+    cache = ModelCache(max_size=2)
+
+    cache.register(MyCachedBaseModel, first)
+    cache.register(MyCachedBaseModel, second)
+
+    assert cache.has_entry(MyCachedBaseModel, first.id)
+
+    cache.register(MyCachedBaseModel, third)
+
+    assert not cache.has_entry(MyCachedBaseModel, first.id)
+    assert cache.has_entry(MyCachedBaseModel, second.id)
+
+    with pytest.raises(RuntimeError, match='.*greater than 0.*'):
+        ModelCache(max_size=0)
@@ -16,6 +16,7 @@ from ormdantic.schema.shareds import (
 from ormdantic.schema.paths import (
     extract,
     extract_as,
+    iterate_extracted,
     get_path_and_types_for,
     get_paths_for
 )
@@ -99,6 +100,17 @@ def test_extract():
     assert ('part1-sub1', 'part1-sub2', 'part2-sub1', 'part2-sub2') == extract(model, '$.parts[*].sub_parts[*].name')
 
 
+def test_iterate_extracted():
+    assert ['start'] == list(iterate_extracted(model, '$.name'))
+    assert ['part1', 'part2'] == list(iterate_extracted(model, '$.parts[*].name'))
+    assert [] == list(iterate_extracted(model, '$.not_existed.not_existed'))
+
+    assert (
+        ['part1-sub1', 'part1-sub2', 'part2-sub1', 'part2-sub2'] 
+        == list(iterate_extracted(model, '$.parts.sub_parts.name'))
+    )
+
+
 def test_extract_as():
     assert 'start' == extract_as(model, '$.name', str)
     assert None is extract_as(model, '$.not_existed.not_existed', str)
@@ -138,4 +150,21 @@ def test_get_paths_for_shared_type():
     assert (
         "$.ref_model",
         "$.ref_model.content.parts"
-    ) == get_paths_for(ReferenceWithPartsModel, ContentReferenceModel)
\ No newline at end of file
+    ) == get_paths_for(ReferenceWithPartsModel, ContentReferenceModel)
+
+def test_get_paths_for_after_update_forward_refs():
+    class NewStartModel(PersistentModel):
+        name:StringIndex
+        parts: List['NewPartModel']
+
+    assert ('$.name',) == get_paths_for(NewStartModel, StringIndex)
+
+    class NewPartModel(PersistentModel):
+        name:StringIndex
+
+    update_forward_refs(NewStartModel, locals())
+
+    assert ('$.name', '$.parts.name') == get_paths_for(NewStartModel, StringIndex)
+    assert [
+        ('$.name', StringIndex), ('$.parts.name', StringIndex)
+    ] == list(get_path_and_types_for(NewStartModel, StringIndex))
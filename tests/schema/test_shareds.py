@@ -298,6 +298,21 @@ def test_populate_shared_models():
     assert contents == extract_shared_models(populated)
 
 
+def test_populate_shared_models_with_same_content():
+    content = MyContent(name='name1')
+
+    container = Container(items=[
+        MySharedModel(content=content.id), MySharedModel(content=content.id)
+    ])
+
+    populated = populate_shared_models(container, ModelCache(entries={
+        (content.id,):{MyContent:content}
+    }))
+
+    assert content == populated.items[0].content
+    assert populated.items[0].content is populated.items[1].content
+
+
 def test_populate_shared_model_return_self_if_no_reference():
     content = MyContent(name='test')
     nested_content = MyNestedModel(shared_model=MySharedModel(content=content.id))
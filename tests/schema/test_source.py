@@ -321,6 +321,23 @@ def test_memory_model_source_delete():
     source.delete(MySharedContent, {'id':first_shared.id}, VersionInfo())
 
 
+def test_memory_model_source_query_after_store_and_delete():
+    source = MemoryModelStorage([found_1])
+
+    assert [found_1] == list(source.query(MyProduct, {'name': 'found product'}))
+
+    source.store([found_2], VersionInfo())
+
+    assert [found_1, found_2] == list(source.query(MyProduct, {'name': 'found product'}))
+    assert [found_2] == list(source.query(MyProduct, {'name': 'found product', 'code': 'found-2'}))
+    assert [] == list(source.query(MyProduct, {'name': 'not existed', 'code': 'found-2'}))
+
+    source.delete(MyProduct, {'code':found_1.code}, version_info=VersionInfo())
+
+    assert [found_2] == list(source.query(MyProduct, {'name': 'found product'}))
+    assert [] == list(source.query_records(MyProduct, {'code': found_1.code}))
+
+
 def test_memory_model_source_purge():
     source = MemoryModelStorage([first_shared, found_1])
 
@@ -1,5 +1,6 @@
 from typing import (
-    ForwardRef, Generic, List, TypeVar, Tuple, get_args, Union, Annotated
+    ForwardRef, Generic, List, TypeVar, Tuple, get_args, Union, Annotated,
+    Callable, NewType
 )
 
 import pytest
@@ -15,7 +16,7 @@ from ormdantic.schema.base import (
 from ormdantic.util.hints import (
     get_args_of_base_generic_alias, get_args_of_list_or_tuple, 
     get_union_type_arguments, is_derived_or_collection_of_derived, 
-    resolve_forward_ref_in_args, get_metadata_for
+    resolve_forward_ref_in_args, get_metadata_for, has_forward_ref, has_metadata
 )
 
 T = TypeVar('T')
@@ -146,6 +147,22 @@ def test_is_derived_from_for_annotated():
     assert is_derived_from(Annotated[int, 0], int)
 
 
+def test_hints_for_unhashable_metadata():
+    unhashable = Annotated[int, {'k': 1}]
+
+    assert is_derived_from(unhashable, int)
+    assert not has_metadata(unhashable, MetaStoredField)
+    assert is_list_or_tuple_of(List[unhashable], int)
+
+    class Model(PersistentModel):
+        value: unhashable
+
+    assert ('value',) == tuple(Model.__fields__)
+
+    with pytest.raises(TypeError):
+        get_mro_with_generic(NewType('NewInt', int))
+
+
 def test_is_collection_type_of():
     assert is_list_or_tuple_of(List[str], str)
     assert is_list_or_tuple_of(List[str])
@@ -203,4 +220,17 @@ def test_get_metadata_for():
     with pytest.raises(RuntimeError):
         get_metadata_for(Annotated[str, MetaStoredField], MetaStoredField)
 
-    
\ No newline at end of file
+    
+
+
+def test_has_forward_ref():
+    model_ref = ForwardRef('Model')
+
+    assert has_forward_ref(model_ref)
+    assert has_forward_ref(List[model_ref])
+    assert has_forward_ref(Annotated[Tuple[int, model_ref], MetaStoredField()])
+    assert has_forward_ref(Callable[[model_ref], int])
+
+    assert not has_forward_ref(int)
+    assert not has_forward_ref(List[int])
+    assert not has_forward_ref(Callable[[int], str])
@@ -25,5 +25,7 @@ def test_digest():
         name:str
 
     assert digest('hello') == 'aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d'
+    assert digest(b'hello') == 'aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d'
+    assert digest('hello', 'md5') == '5d41402abc4b2a76b9719d911017c592'
     assert digest(MyModel(name='name')) == '7687e5ebae02f5340426c1a1a0607681c482354d'
     
\ No newline at end of file